@@ -0,0 +1,75 @@
+"""Convert sign_model.h5 to TFLite for faster CPU inference.
+
+Usage:
+    python convert_model.py          # dynamic-range quantized weights
+    python convert_model.py --fp16   # float16 weights
+    python convert_model.py --int8 --calibration frames.npz
+
+The calibration file for --int8 holds ~200 representative samples as two
+arrays: ``images`` (N, 128, 128, 3) uint8 frames and ``landmarks`` (N, 63)
+MediaPipe hand landmarks, as produced by the server's preprocessing.
+"""
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+ROOT_DIR = Path(__file__).parent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def representative_dataset(calibration_path: Path):
+    """Yield calibration samples in the float format the Keras model expects"""
+    data = np.load(str(calibration_path))
+    images = data['images'].astype(np.float32) / 255.0
+    landmarks = data['landmarks'].astype(np.float32)
+
+    def generator():
+        for image, landmark in zip(images, landmarks):
+            yield [image[np.newaxis], landmark[np.newaxis]]
+    return generator
+
+def convert(model_path: Path, output_path: Path, fp16: bool = False,
+            calibration_path: Path = None):
+    """Convert a Keras H5 model to a TFLite flatbuffer"""
+    model = tf.keras.models.load_model(str(model_path))
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if calibration_path is not None:
+        # Full integer quantization; the server feeds raw uint8 pixels
+        converter.representative_dataset = representative_dataset(calibration_path)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.uint8
+    elif fp16:
+        converter.target_spec.supported_types = [tf.float16]
+
+    tflite_model = converter.convert()
+    output_path.write_bytes(tflite_model)
+    logger.info(f"Wrote {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the sign model to TFLite")
+    parser.add_argument("--model", default=str(ROOT_DIR / 'sign_model.h5'))
+    parser.add_argument("--output", default=str(ROOT_DIR / 'sign_model.tflite'))
+    parser.add_argument("--fp16", action="store_true", help="Store weights as float16")
+    parser.add_argument("--int8", action="store_true", help="Full int8 quantization")
+    parser.add_argument("--calibration", help="Representative samples (.npz) for --int8")
+    args = parser.parse_args()
+
+    if args.int8 and not args.calibration:
+        parser.error("--int8 requires --calibration")
+    if args.calibration and not args.int8:
+        parser.error("--calibration is only used with --int8")
+    if args.int8 and args.fp16:
+        parser.error("--fp16 and --int8 are mutually exclusive")
+
+    convert(
+        Path(args.model),
+        Path(args.output),
+        fp16=args.fp16,
+        calibration_path=Path(args.calibration) if args.int8 else None
+    )
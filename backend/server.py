@@ -2,12 +2,18 @@ import asyncio
 import os
 import logging
 import uuid
-import base64
+import pybase64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 import mediapipe as mp
+
+# oneDNN fused CPU kernels have to be enabled before TensorFlow is imported
+os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
 import tensorflow as tf
 import joblib
+from cachetools import TTLCache
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -16,10 +22,18 @@ from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import socketio
 
+# libjpeg-turbo is optional; fall back to OpenCV's decoder without it
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    TURBO_JPEG = TurboJPEG()
+except Exception:
+    TURBO_JPEG = None
+
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -33,32 +47,216 @@ db = client[os.environ['DB_NAME']]
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Server workers; each is a separate process with its own Socket.IO rooms,
+# so more than one only works when rooms are shared through Redis
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+if WEB_CONCURRENCY > 1 and not os.environ.get('SOCKETIO_REDIS_URL'):
+    logger.error("WEB_CONCURRENCY > 1 requires SOCKETIO_REDIS_URL; room emits would not reach other workers")
+    raise SystemExit(1)
+
+def run_server(app_target, workers: int = 1):
+    """Serve the app with uvicorn on uvloop + httptools"""
+    import uvicorn
+    uvicorn.run(
+        app_target,
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        # Resolve "server:socket_app" from this directory, not the caller's
+        app_dir=str(ROOT_DIR)
+    )
+
+# With several workers, `python server.py` is only the supervisor: hand off
+# to uvicorn now so it never loads the model, MediaPipe or TF thread pools.
+# Each worker imports the app by name and does that setup itself.
+if __name__ == "__main__" and WEB_CONCURRENCY > 1:
+    run_server("server:socket_app", workers=WEB_CONCURRENCY)
+    raise SystemExit(0)
+
 # Initialize MediaPipe
 mp_hands = mp.solutions.hands
 mp_face_mesh = mp.solutions.face_mesh
 mp_drawing = mp.solutions.drawing_utils
 
+# Shared MediaPipe Hands instance (graph is built once, not per frame).
+# Frames from every participant go through it, so it runs in static image
+# mode: video mode would crop each frame around the previous caller's hand.
+# Hands is not thread-safe, so every process() call goes through HANDS_LOCK.
+HANDS = mp_hands.Hands(
+    static_image_mode=True,
+    max_num_hands=1,
+    min_detection_confidence=0.5
+)
+HANDS_LOCK = threading.Lock()
+
+# Frames are downsampled to at most this many pixels per side for MediaPipe
+MEDIAPIPE_MAX_SIZE = 256
+
 # Load ML model and labels
 model = None
 labels = None
+infer_fn = None
+raw_image_input = False  # True when the model consumes unnormalized uint8 pixels
+
+def build_keras_infer_fn(keras_model):
+    """Wrap the model in a traced tf.function to skip Keras predict overhead"""
+    @tf.function(input_signature=[
+        tf.TensorSpec([None, 128, 128, 3], tf.float32),
+        tf.TensorSpec([None, 63], tf.float32),
+    ])
+    def infer(image_batch, landmarks_batch):
+        return keras_model([image_batch, landmarks_batch], training=False)
+    
+    def run(image_batch, landmarks_batch):
+        return infer(
+            tf.constant(image_batch, dtype=tf.float32),
+            tf.constant(landmarks_batch, dtype=tf.float32)
+        ).numpy()
+    return run
+
+def quantize_input(values, details):
+    """Quantize a float array for an int8/uint8 TFLite input"""
+    dtype = details['dtype']
+    if values.dtype == dtype or not np.issubdtype(dtype, np.integer):
+        return values.astype(dtype, copy=False)
+    scale, zero_point = details['quantization']
+    info = np.iinfo(dtype)
+    quantized = np.round(values / scale + zero_point)
+    return np.clip(quantized, info.min, info.max).astype(dtype)
+
+def batch_bucket(batch_size: int):
+    """Smallest fixed batch size that fits batch_size"""
+    return next(size for size in PREDICT_BATCH_BUCKETS if size >= batch_size)
+
+def pad_batch(values, size: int):
+    """Zero-pad a batch along its first axis up to size rows"""
+    if len(values) == size:
+        return values
+    padded = np.zeros((size, *values.shape[1:]), dtype=values.dtype)
+    padded[:len(values)] = values
+    return padded
+
+def build_tflite_infer_fn(interpreters):
+    """Run a converted TFLite model through its default signature"""
+    # One interpreter per batch bucket: each runner keeps a single input
+    # shape, so its tensors are allocated once and never resized
+    runners = {size: interpreter.get_signature_runner()
+               for size, interpreter in interpreters.items()}
+    
+    # Signature input names come from the Keras layers, so match them by rank
+    image_input = landmarks_input = None
+    for name, details in runners[PREDICT_BATCH_BUCKETS[0]].get_input_details().items():
+        if len(details['shape']) == 4:
+            image_input = name, details
+        else:
+            landmarks_input = name, details
+    
+    def run(image_batch, landmarks_batch):
+        # Pad up to the bucket size so the runner sees the shape it already
+        # has allocated; the padding rows are sliced off the output
+        batch_size = len(image_batch)
+        bucket = batch_bucket(batch_size)
+        outputs = runners[bucket](**{
+            image_input[0]: quantize_input(pad_batch(image_batch, bucket), image_input[1]),
+            landmarks_input[0]: quantize_input(pad_batch(landmarks_batch, bucket), landmarks_input[1]),
+        })
+        output = next(iter(outputs.values()))
+        return output[:batch_size].astype(np.float32, copy=False)
+    
+    # An int8 model calibrated on [0, 1] images takes raw uint8 pixels as-is
+    details = image_input[1]
+    scale, zero_point = details['quantization']
+    raw_image = (
+        details['dtype'] == np.uint8
+        and zero_point == 0
+        and np.isclose(scale, 1.0 / 255.0, rtol=1e-3)
+    )
+    return run, raw_image
+
+def warmup_model():
+    """Run dummy batches so tracing and kernel setup happen before the first request"""
+    # The batch worker only ever runs these sizes; on TFLite each one has its
+    # own interpreter, so warming it leaves that allocation in place
+    image_dtype = np.uint8 if raw_image_input else np.float32
+    for batch_size in PREDICT_BATCH_BUCKETS:
+        infer_fn(
+            np.zeros((batch_size, 128, 128, 3), dtype=image_dtype),
+            np.zeros((batch_size, 63), dtype=np.float32)
+        )
+    logger.info(f"Model warmed up for batch sizes {PREDICT_BATCH_BUCKETS}")
 
 def load_ml_model():
-    global model, labels
+    global model, labels, infer_fn, raw_image_input
     try:
         model_path = ROOT_DIR / 'sign_model.h5'
+        tflite_path = ROOT_DIR / 'sign_model.tflite'
         labels_path = ROOT_DIR / 'labels.joblib'
         
-        model = tf.keras.models.load_model(str(model_path))
         labels = joblib.load(str(labels_path))
+        
+        # Prefer the TFLite build (see convert_model.py) when it is present
+        if tflite_path.exists():
+            model = {
+                size: tf.lite.Interpreter(
+                    model_path=str(tflite_path),
+                    num_threads=TF_INTRA_OP_THREADS
+                )
+                for size in PREDICT_BATCH_BUCKETS
+            }
+            infer_fn, raw_image_input = build_tflite_infer_fn(model)
+            logger.info(f"Using TFLite model {tflite_path.name}")
+        else:
+            model = tf.keras.models.load_model(str(model_path))
+            infer_fn = build_keras_infer_fn(model)
+        warmup_model()
         logger.info(f"Model loaded successfully. Classes: {len(labels)}")
         return True
     except Exception as e:
         logger.error(f"Error loading model: {e}")
+        # Don't leave a half-loaded model reporting model_loaded: true
+        model = infer_fn = labels = None
+        raw_image_input = False
         return False
 
+# TensorFlow threading: split the cores between server workers so several
+# processes don't oversubscribe the CPU with their own op thread pools
+TF_INTRA_OP_THREADS = int(os.environ.get(
+    'TF_INTRA_OP_THREADS',
+    max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+))
+TF_INTER_OP_THREADS = int(os.environ.get('TF_INTER_OP_THREADS', '1'))
+tf.config.threading.set_intra_op_parallelism_threads(TF_INTRA_OP_THREADS)
+tf.config.threading.set_inter_op_parallelism_threads(TF_INTER_OP_THREADS)
+
+# Micro-batching of /predict requests
+PREDICT_MAX_BATCH_SIZE = int(os.environ.get('PREDICT_MAX_BATCH_SIZE', '16'))
+# Batches are padded up to one of these sizes so the model sees a few fixed
+# shapes instead of a new one on almost every call
+PREDICT_BATCH_BUCKETS = sorted({size for size in (1, 4, 8, 16) if size < PREDICT_MAX_BATCH_SIZE}
+                               | {PREDICT_MAX_BATCH_SIZE})
+PREDICT_BATCH_TIMEOUT = float(os.environ.get('PREDICT_BATCH_TIMEOUT_MS', '8')) / 1000.0
+PREDICT_QUEUE: asyncio.Queue = asyncio.Queue()
+batch_worker_task = None
+
 # Load model on startup
 load_ml_model()
 
+# Keep CPU-bound work off the event loop: decode/landmarks run on a pool
+# sized to the machine, while model inference is owned by a single thread
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='preprocess')
+MODEL_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model')
+
+INV_255 = np.float32(1.0 / 255.0)
+
+# Newest unprocessed socket frame per connection; a new frame replaces the
+# pending one so captions track the latest frame instead of falling behind
+# Each connection has at most one frame in flight, so a slow frame only
+# delays that connection; batching across connections is left to batch_worker
+latest_frames: Dict[str, dict] = {}
+frame_tasks: Dict[str, asyncio.Task] = {}
+
 # Pydantic Models
 class Room(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -93,14 +291,39 @@ class Caption(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     confidence: float
 
+# Participants are looked up on every accepted prediction
+PARTICIPANT_CACHE = TTLCache(maxsize=10_000, ttl=30)
+
+# Captions are buffered and bulk-inserted instead of one write per prediction
+CAPTION_FLUSH_SIZE = 100
+CAPTION_FLUSH_INTERVAL = 0.25
+CAPTION_BUFFER_MAX = 10_000  # Unsaved captions kept while Mongo is unavailable
+DUPLICATE_KEY_ERROR = 11000
+caption_buffer: List[dict] = []
+caption_flusher_task = None
+
+# Only the fields the Caption model needs
+CAPTION_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "text": 1,
+    "participant_name": 1,
+    "room_id": 1,
+    "timestamp": 1,
+    "confidence": 1
+}
+
 # FastAPI app
 app = FastAPI(title="SignMeet API", description="Sign Language Video Calling Platform")
 api_router = APIRouter(prefix="/api")
 
-# Socket.IO server
+# Socket.IO server. With several workers, rooms must be shared through
+# Redis so an emit from one worker reaches clients connected to another
+redis_url = os.environ.get('SOCKETIO_REDIS_URL')
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins="*",
+    client_manager=socketio.AsyncRedisManager(redis_url) if redis_url else None,
     logger=True,
     engineio_logger=True
 )
@@ -110,58 +333,152 @@ socket_app = socketio.ASGIApp(sio, app)
 
 # ML Processing Functions
 def extract_landmarks(image):
-    """Extract MediaPipe landmarks from image"""
+    """Extract MediaPipe landmarks from image, plus whether a hand was found"""
     try:
+        # Palm detection cost scales with pixel count; landmarks come back
+        # normalized, so shrinking large frames needs no rescaling after
+        height, width = image.shape[:2]
+        scale = MEDIAPIPE_MAX_SIZE / max(height, width)
+        if scale < 1:
+            image = cv2.resize(
+                image,
+                (round(width * scale), round(height * scale)),
+                interpolation=cv2.INTER_AREA
+            )
+        
         # Convert image to RGB
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
-        landmarks_array = np.zeros(63)  # 21*3 = 63 for hand landmarks
-        
         # Process hands
-        with mp_hands.Hands(
-            static_image_mode=True,
-            max_num_hands=1,
-            min_detection_confidence=0.5
-        ) as hands:
-            results = hands.process(rgb_image)
-            
-            if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                for i, landmark in enumerate(hand_landmarks.landmark):
-                    if i < 21:  # Only use first 21 landmarks
-                        landmarks_array[i*3] = landmark.x
-                        landmarks_array[i*3+1] = landmark.y
-                        landmarks_array[i*3+2] = landmark.z
+        with HANDS_LOCK:
+            results = HANDS.process(rgb_image)
+        
+        if not results.multi_hand_landmarks:
+            return np.zeros(63, dtype=np.float32), False  # 21*3 = 63 for hand landmarks
+        
+        # Only use first 21 landmarks, flattened to x0, y0, z0, x1, ...
+        hand_landmarks = results.multi_hand_landmarks[0].landmark[:21]
+        landmarks_array = np.array(
+            [(landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks],
+            dtype=np.float32
+        ).ravel()
         
-        return landmarks_array
+        return landmarks_array, True
     except Exception as e:
         logger.error(f"Error extracting landmarks: {e}")
-        return np.zeros(63)
+        return np.zeros(63, dtype=np.float32), False
+
+def decode_image(image_bytes: bytes):
+    """Decode JPEG bytes to a BGR image, preferring libjpeg-turbo"""
+    if TURBO_JPEG is not None:
+        try:
+            return TURBO_JPEG.decode(image_bytes, pixel_format=TJPF_BGR)
+        except Exception:
+            pass  # Not a JPEG turbojpeg can read; let OpenCV try
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+def preprocess_frame(image_bytes: bytes):
+    """Decode JPEG bytes into a uint8 128x128 frame, landmarks and hand flag"""
+    image = decode_image(image_bytes)
+    
+    # Extract landmarks
+    landmarks, detected = extract_landmarks(image)
+    if not detected:
+        return None, landmarks, False
+    
+    # Resize image to model input size (128x128); normalisation happens
+    # when the batch worker copies the frame into its input buffer
+    if image.shape[:2] != (128, 128):
+        image = cv2.resize(image, (128, 128))
+    
+    return image, landmarks, True
+
+def preprocess_base64_frame(image_data: str):
+    """Decode a base64 data URL, then preprocess it like a binary frame"""
+    # Skip the "data:image/jpeg;base64," header without splitting the string
+    start = image_data.find(',') + 1
+    image_bytes = pybase64.b64decode(image_data[start:], validate=False)
+    return preprocess_frame(image_bytes)
+
+def run_model(image_batch, landmarks_batch):
+    """Run the sign model on a stacked batch"""
+    return infer_fn(image_batch, landmarks_batch)
+
+async def batch_worker():
+    """Coalesce queued frames into a single model call"""
+    loop = asyncio.get_running_loop()
+    
+    # Model inputs are written in place; only this task touches the buffers
+    image_dtype = np.uint8 if raw_image_input else np.float32
+    image_buffer = np.zeros((PREDICT_MAX_BATCH_SIZE, 128, 128, 3), dtype=image_dtype)
+    landmarks_buffer = np.zeros((PREDICT_MAX_BATCH_SIZE, 63), dtype=np.float32)
+    
+    while True:
+        batch = [await PREDICT_QUEUE.get()]
+        deadline = loop.time() + PREDICT_BATCH_TIMEOUT
+        
+        # Keep collecting until the batch is full or the timeout expires
+        while len(batch) < PREDICT_MAX_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(PREDICT_QUEUE.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        futures = [future for _, _, future in batch]
+        try:
+            for i, (image, landmarks, _) in enumerate(batch):
+                if raw_image_input:
+                    image_buffer[i] = image
+                else:
+                    # Cast and scale to [0, 1] in a single pass
+                    np.multiply(image, INV_255, out=image_buffer[i], dtype=np.float32)
+                landmarks_buffer[i] = landmarks
+            # Run a whole bucket straight from the buffers; rows past the
+            # batch hold leftovers from earlier batches and are dropped below
+            bucket = batch_bucket(len(batch))
+            image_batch = image_buffer[:bucket]
+            landmarks_batch = landmarks_buffer[:bucket]
+            predictions = await loop.run_in_executor(
+                MODEL_EXECUTOR, run_model, image_batch, landmarks_batch
+            )
+            predictions = predictions[:len(batch)]
+        except Exception as e:
+            logger.error(f"Error in batch prediction: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        
+        for future, prediction in zip(futures, predictions):
+            if not future.done():
+                future.set_result(prediction)
 
-def predict_sign(image_data: str):
-    """Predict sign language from base64 image"""
+async def infer_frame(preprocess, payload):
+    """Preprocess a frame on the executor and classify it via the batch worker"""
     try:
         if model is None or labels is None:
             return None, 0.0
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data.split(',')[1])
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        loop = asyncio.get_running_loop()
+        image, landmarks, detected = await loop.run_in_executor(
+            EXECUTOR, preprocess, payload
+        )
         
-        # Resize image to model input size (128x128)
-        image_resized = cv2.resize(image, (128, 128))
-        image_normalized = image_resized.astype(np.float32) / 255.0
-        image_batch = np.expand_dims(image_normalized, axis=0)
+        # No hand in frame: nothing to classify, skip the model entirely
+        if not detected:
+            return None, 0.0
         
-        # Extract landmarks
-        landmarks = extract_landmarks(image)
-        landmarks_batch = np.expand_dims(landmarks, axis=0)
+        # Hand the frame to the batch worker and wait for its row
+        future = loop.create_future()
+        await PREDICT_QUEUE.put((image, landmarks, future))
+        prediction = await future
         
-        # Make prediction
-        prediction = model.predict([image_batch, landmarks_batch], verbose=0)
-        predicted_class = np.argmax(prediction[0])
-        confidence = float(np.max(prediction[0]))
+        predicted_class = np.argmax(prediction)
+        confidence = float(np.max(prediction))
         
         predicted_label = labels[predicted_class]
         
@@ -171,6 +488,149 @@ def predict_sign(image_data: str):
         logger.error(f"Error in prediction: {e}")
         return None, 0.0
 
+async def predict_sign(image_data: str):
+    """Predict sign language from base64 image"""
+    return await infer_frame(preprocess_base64_frame, image_data)
+
+async def predict_sign_bytes(image_bytes: bytes):
+    """Predict sign language from raw JPEG bytes"""
+    return await infer_frame(preprocess_frame, image_bytes)
+
+def requeue_captions(batch: List[dict]):
+    """Put unsaved captions back at the front of the buffer, oldest first"""
+    global caption_buffer
+    caption_buffer[:0] = batch
+    overflow = len(caption_buffer) - CAPTION_BUFFER_MAX
+    if overflow > 0:
+        logger.error(f"Caption buffer full, dropping {overflow} oldest unsaved captions")
+        del caption_buffer[:overflow]
+
+async def flush_captions():
+    """Write all buffered captions to Mongo in one insert_many"""
+    global caption_buffer
+    if not caption_buffer:
+        return
+    
+    # Swap before awaiting so captions arriving mid-write go to the next batch
+    batch, caption_buffer = caption_buffer, []
+    try:
+        await db.captions.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        # insert_many gave each document an _id, so a duplicate key means
+        # that caption was already written by an earlier attempt
+        failed = [error['index'] for error in e.details.get('writeErrors', [])
+                  if error.get('code') != DUPLICATE_KEY_ERROR]
+        if failed:
+            logger.error(f"Error saving {len(failed)} captions, will retry: {e}")
+            requeue_captions([batch[i] for i in failed])
+    except asyncio.CancelledError:
+        requeue_captions(batch)
+        raise
+    except Exception as e:
+        logger.error(f"Error saving captions, will retry: {e}")
+        requeue_captions(batch)
+
+async def caption_flusher():
+    """Periodically flush buffered captions"""
+    while True:
+        await asyncio.sleep(CAPTION_FLUSH_INTERVAL)
+        await flush_captions()
+
+async def get_participant(participant_id: str):
+    """Look up a participant, serving repeat lookups from PARTICIPANT_CACHE"""
+    participant = PARTICIPANT_CACHE.get(participant_id)
+    if participant is None:
+        participant_data = await db.participants.find_one({"id": participant_id})
+        if not participant_data:
+            return None
+        participant = Participant(**participant_data)
+        PARTICIPANT_CACHE[participant_id] = participant
+    return participant
+
+async def publish_caption(predicted_text: str, confidence: float, room_id: str, participant_id: str):
+    """Save a caption and broadcast it to the room"""
+    # Get participant info
+    participant = await get_participant(participant_id)
+    if not participant:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    
+    # Create caption
+    caption = Caption(
+        text=predicted_text,
+        participant_name=participant.name,
+        room_id=room_id,
+        confidence=confidence
+    )
+    
+    # Queue caption for the next bulk insert
+    caption_buffer.append(caption.model_dump())
+    if len(caption_buffer) >= CAPTION_FLUSH_SIZE:
+        await flush_captions()
+    
+    # Broadcast caption to room
+    await sio.emit('new_caption', caption.model_dump(mode='json'), room=room_id)
+
+async def process_frame(sid: str, data: dict):
+    """Run inference on a socket frame and report it back to the sender"""
+    room_id = data.get('room_id')
+    participant_id = data.get('participant_id')
+    image_data = data.get('image_data')
+    
+    try:
+        # Binary attachments arrive as bytes, data URLs as str
+        if isinstance(image_data, bytes):
+            predicted_text, confidence = await predict_sign_bytes(image_data)
+        else:
+            predicted_text, confidence = await predict_sign(image_data)
+        
+        if predicted_text and confidence > 0.7:  # Confidence threshold
+            await publish_caption(predicted_text, confidence, room_id, participant_id)
+        else:
+            predicted_text = None
+    
+    except Exception as e:
+        logger.error(f"Socket prediction error: {e}")
+        predicted_text, confidence = None, 0.0
+    
+    await sio.emit('caption', {
+        'frame_id': data.get('frame_id'),
+        'predicted_text': predicted_text,
+        'confidence': confidence
+    }, room=sid)
+
+def start_frame(sid: str, data: dict):
+    """Start processing a client's frame and chain its next one when done"""
+    task = asyncio.create_task(process_frame(sid, data))
+    frame_tasks[sid] = task
+    task.add_done_callback(lambda done: finish_frame(sid, done))
+
+def finish_frame(sid: str, task: asyncio.Task):
+    """Clear a finished frame and start the client's newest pending frame"""
+    if not task.cancelled() and task.exception():
+        logger.error(f"Frame processing error for {sid}: {task.exception()}")
+    
+    if frame_tasks.get(sid) is not task:
+        return  # Client was dropped while this frame was running
+    del frame_tasks[sid]
+    
+    data = latest_frames.pop(sid, None)
+    if data is not None:
+        start_frame(sid, data)
+
+def enqueue_frame(sid: str, data: dict):
+    """Run a client's frame now, or park it as the newest pending one if busy"""
+    if sid in frame_tasks:
+        latest_frames[sid] = data
+    else:
+        start_frame(sid, data)
+
+def drop_pending_frame(sid: str):
+    """Drop a client's pending frame and cancel the one in flight"""
+    latest_frames.pop(sid, None)
+    task = frame_tasks.pop(sid, None)
+    if task:
+        task.cancel()
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -179,8 +639,8 @@ async def root():
 @api_router.post("/rooms", response_model=Room)
 async def create_room(room_data: RoomCreate):
     """Create a new room"""
-    room = Room(**room_data.dict())
-    await db.rooms.insert_one(room.dict())
+    room = Room(**room_data.model_dump())
+    await db.rooms.insert_one(room.model_dump())
     return room
 
 @api_router.get("/rooms/{room_id}", response_model=Room)
@@ -206,7 +666,7 @@ async def join_room(room_id: str, participant_data: ParticipantCreate):
         raise HTTPException(status_code=400, detail="Room is full")
     
     # Create participant
-    participant = Participant(room_id=room_id, **participant_data.dict())
+    participant = Participant(room_id=room_id, **participant_data.model_dump())
     
     # Add participant to room
     await db.rooms.update_one(
@@ -215,11 +675,11 @@ async def join_room(room_id: str, participant_data: ParticipantCreate):
     )
     
     # Save participant
-    await db.participants.insert_one(participant.dict())
+    await db.participants.insert_one(participant.model_dump())
     
     # Notify other participants
     await sio.emit('participant_joined', {
-        'participant': participant.dict(),
+        'participant': participant.model_dump(mode='json'),
         'room_id': room_id
     }, room=room_id)
     
@@ -229,30 +689,27 @@ async def join_room(room_id: str, participant_data: ParticipantCreate):
 async def predict_sign_language(request: PredictionRequest):
     """Predict sign language from image"""
     try:
-        predicted_text, confidence = predict_sign(request.image_data)
+        predicted_text, confidence = await predict_sign(request.image_data)
         
         if predicted_text and confidence > 0.7:  # Confidence threshold
-            # Get participant info
-            participant_data = await db.participants.find_one({"id": request.participant_id})
-            if not participant_data:
-                raise HTTPException(status_code=404, detail="Participant not found")
-            
-            participant = Participant(**participant_data)
-            
-            # Create caption
-            caption = Caption(
-                text=predicted_text,
-                participant_name=participant.name,
-                room_id=request.room_id,
-                confidence=confidence
-            )
-            
-            # Save caption
-            await db.captions.insert_one(caption.dict())
-            
-            # Broadcast caption to room
-            await sio.emit('new_caption', caption.dict(), room=request.room_id)
-            
+            await publish_caption(predicted_text, confidence, request.room_id, request.participant_id)
+            return {"predicted_text": predicted_text, "confidence": confidence}
+        
+        return {"predicted_text": None, "confidence": confidence}
+        
+    except Exception as e:
+        logger.error(f"Prediction error: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+@api_router.post("/predict_binary")
+async def predict_sign_language_binary(room_id: str, participant_id: str, image: UploadFile = File(...)):
+    """Predict sign language from a raw JPEG upload (no base64 overhead)"""
+    try:
+        image_bytes = await image.read()
+        predicted_text, confidence = await predict_sign_bytes(image_bytes)
+        
+        if predicted_text and confidence > 0.7:  # Confidence threshold
+            await publish_caption(predicted_text, confidence, room_id, participant_id)
             return {"predicted_text": predicted_text, "confidence": confidence}
         
         return {"predicted_text": None, "confidence": confidence}
@@ -265,7 +722,8 @@ async def predict_sign_language(request: PredictionRequest):
 async def get_room_captions(room_id: str):
     """Get recent captions for a room"""
     captions = await db.captions.find(
-        {"room_id": room_id}
+        {"room_id": room_id},
+        projection=CAPTION_PROJECTION
     ).sort("timestamp", -1).limit(50).to_list(50)
     
     return [Caption(**caption) for caption in captions]
@@ -277,6 +735,7 @@ async def connect(sid, environ):
 
 @sio.event
 async def disconnect(sid):
+    drop_pending_frame(sid)
     logger.info(f"Client {sid} disconnected")
 
 @sio.event
@@ -297,11 +756,24 @@ async def join_room(sid, data):
 async def leave_room(sid, data):
     """Leave a Socket.IO room"""
     room_id = data.get('room_id')
+    participant_id = data.get('participant_id')
+    
+    if participant_id:
+        PARTICIPANT_CACHE.pop(participant_id, None)
+    
     if room_id:
         await sio.leave_room(sid, room_id)
         await sio.emit('user_left', {'sid': sid}, room=room_id, skip_sid=sid)
         logger.info(f"Client {sid} left room {room_id}")
 
+@sio.event
+async def predict(sid, data):
+    """Queue a frame sent over the socket; the result arrives as a 'caption' event"""
+    if not data.get('image_data'):
+        return
+    
+    enqueue_frame(sid, data)
+
 @sio.event
 async def webrtc_offer(sid, data):
     """Handle WebRTC offer"""
@@ -362,14 +834,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_indexes():
+    # Recent-captions query is served straight off this index
+    await db.captions.create_index([("room_id", 1), ("timestamp", -1)])
+    # Lookups go by our own "id" field, not Mongo's _id
+    await db.rooms.create_index("id", unique=True)
+    await db.participants.create_index("id", unique=True)
+
+@app.on_event("startup")
+async def start_batch_worker():
+    global batch_worker_task
+    batch_worker_task = asyncio.create_task(batch_worker())
+
+@app.on_event("startup")
+async def start_caption_flusher():
+    global caption_flusher_task
+    caption_flusher_task = asyncio.create_task(caption_flusher())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if batch_worker_task:
+        batch_worker_task.cancel()
+    for sid in list(frame_tasks):
+        drop_pending_frame(sid)
+    if caption_flusher_task:
+        # Let a cancelled mid-insert flush hand its batch back before the
+        # final flush picks up everything that is left
+        caption_flusher_task.cancel()
+        try:
+            await caption_flusher_task
+        except asyncio.CancelledError:
+            pass
+    await flush_captions()
     client.close()
+    EXECUTOR.shutdown(wait=False)
+    MODEL_EXECUTOR.shutdown(wait=False)
+    # A preprocess thread may still be inside HANDS.process()
+    with HANDS_LOCK:
+        HANDS.close()
 
 # Use the Socket.IO ASGI app as the main app
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(socket_app, host="0.0.0.0", port=8001)
+    run_server(socket_app)
 
 # Export the socket_app for production
 application = socket_app
\ No newline at end of file
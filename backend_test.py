@@ -3,8 +3,16 @@ import sys
 import json
 import base64
 import time
+import threading
 from datetime import datetime
 
+import socketio
+
+# Create a simple test image (1x1 pixel base64 encoded)
+# This is a minimal JPEG image in base64
+TEST_IMAGE_B64 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQEAYABgAAD/2wBDAAEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQH/2wBDAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQH/wAARCAABAAEDASIAAhEBAxEB/8QAFQABAQAAAAAAAAAAAAAAAAAAAAv/xAAUEAEAAAAAAAAAAAAAAAAAAAAA/8QAFQEBAQAAAAAAAAAAAAAAAAAAAAX/xAAUEQEAAAAAAAAAAAAAAAAAAAAA/9oADAMBAAIRAxEAPwA/8A"
+TEST_IMAGE_BYTES = base64.b64decode(TEST_IMAGE_B64.split(',')[1])
+
 class SignMeetAPITester:
     def __init__(self, base_url="https://signmeet.preview.emergentagent.com"):
         self.base_url = base_url
@@ -14,11 +22,12 @@ class SignMeetAPITester:
         self.room_id = None
         self.participant_id = None
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
+    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, files=None, params=None):
         """Run a single API test"""
         url = f"{self.api_url}/{endpoint}" if endpoint else f"{self.api_url}/"
         if headers is None:
-            headers = {'Content-Type': 'application/json'}
+            # Let requests set the multipart boundary for file uploads
+            headers = {} if files else {'Content-Type': 'application/json'}
 
         self.tests_run += 1
         print(f"\n🔍 Testing {name}...")
@@ -27,8 +36,10 @@ class SignMeetAPITester:
         try:
             if method == 'GET':
                 response = requests.get(url, headers=headers, timeout=10)
+            elif method == 'POST' and files:
+                response = requests.post(url, files=files, params=params, headers=headers, timeout=10)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                response = requests.post(url, json=data, params=params, headers=headers, timeout=10)
             elif method == 'PUT':
                 response = requests.put(url, json=data, headers=headers, timeout=10)
             elif method == 'DELETE':
@@ -142,23 +153,106 @@ class SignMeetAPITester:
             print("❌ Skipped - No room or participant ID available")
             return False
 
-        # Create a simple test image (1x1 pixel base64 encoded)
-        # This is a minimal JPEG image in base64
-        test_image_b64 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQEAYABgAAD/2wBDAAEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQH/2wBDAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQEBAQH/wAARCAABAAEDASIAAhEBAxEB/8QAFQABAQAAAAAAAAAAAAAAAAAAAAv/xAAUEAEAAAAAAAAAAAAAAAAAAAAA/8QAFQEBAQAAAAAAAAAAAAAAAAAAAAX/xAAUEQEAAAAAAAAAAAAAAAAAAAAA/9oADAMBAAIRAxEAPwA/8A"
-        
         success, response = self.run_test(
             "Predict Sign Language",
             "POST",
             "predict",
             200,
             data={
-                "image_data": test_image_b64,
+                "image_data": TEST_IMAGE_B64,
+                "room_id": self.room_id,
+                "participant_id": self.participant_id
+            }
+        )
+        return success
+
+    def test_predict_sign_language_binary(self):
+        """Test sign language prediction with a raw JPEG upload"""
+        if not self.room_id or not self.participant_id:
+            print("❌ Skipped - No room or participant ID available")
+            return False
+
+        success, response = self.run_test(
+            "Predict Sign Language (Binary)",
+            "POST",
+            "predict_binary",
+            200,
+            files={"image": ("frame.jpg", TEST_IMAGE_BYTES, "image/jpeg")},
+            params={
                 "room_id": self.room_id,
                 "participant_id": self.participant_id
             }
         )
         return success
 
+    def test_predict_binary_missing_params(self):
+        """Test binary prediction without room/participant query params"""
+        success, response = self.run_test(
+            "Binary Prediction Missing Params",
+            "POST",
+            "predict_binary",
+            422,  # Validation error
+            files={"image": ("frame.jpg", TEST_IMAGE_BYTES, "image/jpeg")}
+            # Missing room_id and participant_id
+        )
+        return success
+
+    def connect_socket(self, handlers):
+        """Open a Socket.IO client, register event handlers and join the test room"""
+        client = socketio.Client()
+        for event, handler in handlers.items():
+            client.on(event, handler)
+        client.connect(self.base_url, wait_timeout=10)
+        client.emit('join_room', {
+            'room_id': self.room_id,
+            'participant_id': self.participant_id
+        })
+        return client
+
+    def test_socket_predict(self):
+        """Test streaming a frame over Socket.IO returns a caption tagged with its frame_id"""
+        if not self.room_id or not self.participant_id:
+            print("❌ Skipped - No room or participant ID available")
+            return False
+
+        self.tests_run += 1
+        print(f"\n🔍 Testing Socket Predict...")
+
+        received = threading.Event()
+        result = {}
+
+        def on_caption(data):
+            result.update(data)
+            received.set()
+
+        client = None
+        try:
+            client = self.connect_socket({'caption': on_caption})
+            client.emit('predict', {
+                'frame_id': 1,
+                'image_data': TEST_IMAGE_BYTES,
+                'room_id': self.room_id,
+                'participant_id': self.participant_id
+            })
+
+            if not received.wait(timeout=10):
+                print("❌ Failed - No caption event received")
+                return False
+            if result.get('frame_id') != 1 or 'confidence' not in result:
+                print(f"❌ Failed - Unexpected caption payload: {result}")
+                return False
+
+            self.tests_passed += 1
+            print(f"✅ Passed - Caption: {result}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        finally:
+            if client:
+                client.disconnect()
+
     def test_get_room_captions(self):
         """Test getting room captions"""
         if not self.room_id:
@@ -213,6 +307,9 @@ def main():
         ("Join Room", tester.test_join_room),
         ("Join Non-existent Room", tester.test_join_nonexistent_room),
         ("Predict Sign Language", tester.test_predict_sign_language),
+        ("Predict Sign Language (Binary)", tester.test_predict_sign_language_binary),
+        ("Binary Prediction Missing Params", tester.test_predict_binary_missing_params),
+        ("Socket Predict", tester.test_socket_predict),
         ("Get Room Captions", tester.test_get_room_captions),
         ("Invalid Endpoints", tester.test_invalid_endpoints),
     ]
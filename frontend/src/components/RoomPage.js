@@ -26,6 +26,7 @@ const RoomPage = () => {
   const [isVideoOff, setIsVideoOff] = useState(false);
   const [messages, setMessages] = useState([]);
   const [captions, setCaptions] = useState([]);
+  const [latestPrediction, setLatestPrediction] = useState(null);
   const [error, setError] = useState('');
   const [loading, setLoading] = useState(true);
 
@@ -35,6 +36,8 @@ const RoomPage = () => {
   const socketRef = useRef(null);
   const participantRef = useRef(null);
   const captionIntervalRef = useRef(null);
+  const frameIdRef = useRef(0);
+  const lastFrameIdRef = useRef(-1);
 
   // Initialize room and participant
   useEffect(() => {
@@ -136,6 +139,7 @@ const RoomPage = () => {
     socket.on('webrtc_ice_candidate', handleWebRTCIceCandidate);
     socket.on('new_message', handleNewMessage);
     socket.on('new_caption', handleNewCaption);
+    socket.on('caption', handleCaption);
 
     return () => {
       socket.off('user_joined');
@@ -145,6 +149,7 @@ const RoomPage = () => {
       socket.off('webrtc_ice_candidate');
       socket.off('new_message');
       socket.off('new_caption');
+      socket.off('caption');
     };
   }, [socket, localStream]);
 
@@ -247,6 +252,13 @@ const RoomPage = () => {
     setCaptions(prev => [data, ...prev.slice(0, 49)]); // Keep last 50 captions
   }, []);
 
+  const handleCaption = useCallback((data) => {
+    // Results can arrive out of order; only show the newest frame's
+    if (data.frame_id <= lastFrameIdRef.current) return;
+    lastFrameIdRef.current = data.frame_id;
+    setLatestPrediction(data);
+  }, []);
+
   // Sign language detection
   const startSignLanguageDetection = (stream) => {
     const canvas = document.createElement('canvas');
@@ -266,18 +278,16 @@ const RoomPage = () => {
           ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
           
           canvas.toBlob(async (blob) => {
-            if (blob && participantRef.current) {
-              const base64 = await blobToBase64(blob);
-              
-              try {
-                await axios.post(`${API}/predict`, {
-                  image_data: base64,
-                  room_id: roomId,
-                  participant_id: participantRef.current.id
-                });
-              } catch (err) {
-                console.error('Error predicting sign:', err);
-              }
+            if (blob && participantRef.current && socketRef.current) {
+              // Fire and forget: the result comes back as a 'caption' event
+              // tagged with this frame_id, so the next frame can go out
+              // while the server is still working on this one
+              socketRef.current.emit('predict', {
+                frame_id: frameIdRef.current++,
+                image_data: await blob.arrayBuffer(),
+                room_id: roomId,
+                participant_id: participantRef.current.id
+              });
             }
           }, 'image/jpeg', 0.8);
         }
@@ -285,14 +295,6 @@ const RoomPage = () => {
     };
   };
 
-  const blobToBase64 = (blob) => {
-    return new Promise((resolve) => {
-      const reader = new FileReader();
-      reader.onloadend = () => resolve(reader.result);
-      reader.readAsDataURL(blob);
-    });
-  };
-
   // Control functions
   const toggleAudio = () => {
     if (localStream) {
@@ -324,7 +326,10 @@ const RoomPage = () => {
 
   const leaveRoom = () => {
     if (socket) {
-      socket.emit('leave_room', { room_id: roomId });
+      socket.emit('leave_room', {
+        room_id: roomId,
+        participant_id: participantRef.current?.id
+      });
     }
     navigate('/');
   };
@@ -367,6 +372,7 @@ const RoomPage = () => {
             localVideoRef={localVideoRef}
             peers={peers}
             participant={participant}
+            latestPrediction={latestPrediction}
           />
           
           <div className="controls-bar">
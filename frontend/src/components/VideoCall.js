@@ -1,6 +1,6 @@
 import React, { useEffect, useRef } from 'react';
 
-const VideoCall = ({ localStream, localVideoRef, peers, participant }) => {
+const VideoCall = ({ localStream, localVideoRef, peers, participant, latestPrediction }) => {
   const remoteVideoRefs = useRef({});
 
   // Update remote video streams
@@ -60,7 +60,9 @@ const VideoCall = ({ localStream, localVideoRef, peers, participant }) => {
             {participant?.name || 'You'} (You)
           </div>
           <div className="caption-overlay">
-            {localStream ? 'Sign recognition active...' : 'Text chat available'}
+            {localStream
+              ? (latestPrediction?.predicted_text || 'Sign recognition active...')
+              : 'Text chat available'}
           </div>
         </div>
       </div>